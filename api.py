@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Lekkie API JSON z tym samym filtrowaniem co app.py (bez Streamlita).
+
+Uruchomienie obok aplikacji:  python api.py  (domyślnie http://localhost:8502)
+
+Endpointy:
+  /guide      ?channel=HBO&channel=TVN&date_from=2026-03-06&date_to=2026-03-08
+              &time_from=18:00&time_to=23:59&min_rating=6&genre=Dramat
+              &sort=time|rating|title&limit=100
+  /now        ?channel=HBO&at=2026-03-06T21:00
+  /streaming  ?platform=Netflix&min_rating=6&all=1
+
+Odpowiedzi mają ETag zależny od wersji danych i znormalizowanego zapytania,
+więc klient z If-None-Match dostaje 304 bez ponownej serializacji.
+"""
+
+import os
+import json
+import math
+import hashlib
+import threading
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from utils.models import to_epoch, from_epoch, epg_now
+from utils.indexes import tmdb_ids_for_genres, now_next
+from utils.guide import MOVIES_FILE, STREAMING_FILE, SORT_KEYS, load_streaming, filter_programmes, filter_streaming
+from utils.availability import AVAILABILITY_FILE
+from utils.snapshot import SNAPSHOT_FILE, load_state
+
+API_HOST = os.getenv('API_HOST', '127.0.0.1')
+API_PORT = int(os.getenv('API_PORT', '8502'))
+CACHE_SIZE = 512
+DATA_FILES = (MOVIES_FILE, MOVIES_FILE + '.gz', MOVIES_FILE + '.zst', STREAMING_FILE, AVAILABILITY_FILE, SNAPSHOT_FILE)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class GuideData:
+    """Niezmienna wersja danych - zapytanie od początku do końca widzi jedną"""
+    version: str
+    updated_at: str | None
+    programmes: tuple
+    channels: list
+    genre_index: dict
+    interval_index: dict
+    streaming: list
+    availability: dict
+
+
+class GuideStore:
+    """Dane i indeksy przeładowywane, gdy zmieni się któryś z plików data/"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.data = None
+        self.responses = OrderedDict()
+
+    def _file_stamp(self):
+        return tuple(
+            os.stat(path).st_mtime_ns if os.path.exists(path) else None
+            for path in DATA_FILES
+        )
+
+    def refresh(self):
+        """Zwraca aktualne GuideData, przeładowując je po zmianie plików"""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return self.data
+        with self._lock:
+            if stamp == self._stamp:
+                return self.data
+            state = load_state()
+            guide = state['guide'] or {'updated_at': None, 'movies': ()}
+            streaming = load_streaming() or {'updated_at': None, 'movies': []}
+
+            self.data = GuideData(
+                version=hashlib.sha1(repr(stamp).encode()).hexdigest()[:16],
+                updated_at=guide['updated_at'],
+                programmes=guide['movies'],
+                channels=state['channels'],
+                genre_index=state['genre_index'],
+                interval_index=state['interval_index'],
+                streaming=streaming['movies'],
+                availability=state['availability'],
+            )
+            self.responses.clear()
+            self._stamp = stamp
+            return self.data
+
+    def etag(self, data, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return f'"{data.version}-{digest}"'
+
+    def body(self, data, key, build):
+        """Zwraca zserializowaną odpowiedź dla wersji danych i zapytania (LRU)"""
+        key = (data.version, key)
+        with self._lock:
+            body = self.responses.get(key)
+            if body is not None:
+                self.responses.move_to_end(key)
+                return body
+        body = json.dumps(build(data), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with self._lock:
+            # Dane mogły się zmienić w trakcie budowania - nie zapisujemy starej wersji
+            if self.data is data:
+                self.responses[key] = body
+                if len(self.responses) > CACHE_SIZE:
+                    self.responses.popitem(last=False)
+        return body
+
+
+STORE = GuideStore()
+
+
+def _list(query, name):
+    """Parametr wielokrotny lub rozdzielany przecinkami, znormalizowany"""
+    values = []
+    for raw in query.get(name, []):
+        values.extend(v.strip() for v in raw.split(',') if v.strip())
+    return tuple(sorted(set(values)))
+
+
+def _one(query, name, parse, default=None):
+    values = query.get(name)
+    if not values or not values[-1]:
+        return default
+    try:
+        return parse(values[-1])
+    except ValueError:
+        raise BadRequest(f"Niepoprawny parametr {name}: {values[-1]}")
+
+
+def _bool(value):
+    return value.lower() in ('1', 'true', 'yes', 'tak')
+
+
+def _limit(value):
+    limit = int(value)
+    if limit < 0:
+        raise ValueError(value)
+    return limit
+
+
+def _rating(value):
+    rating = float(value)
+    if not math.isfinite(rating):
+        raise ValueError(value)
+    return rating
+
+
+def programme_json(m, availability):
+    d = m.to_dict()
+    entry = availability.get(m.tmdb.tmdb_id) if m.tmdb else None
+    if entry:
+        d['platforms'] = entry['platforms']
+    return d
+
+
+def guide_endpoint(query):
+    sort = _one(query, 'sort', str, 'time')
+    if sort not in SORT_KEYS:
+        raise BadRequest(f"Niepoprawny parametr sort: {sort}")
+    params = (
+        ('channels', _list(query, 'channel')),
+        ('date_from', _one(query, 'date_from', date.fromisoformat)),
+        ('date_to', _one(query, 'date_to', date.fromisoformat)),
+        ('time_from', _one(query, 'time_from', time.fromisoformat)),
+        ('time_to', _one(query, 'time_to', time.fromisoformat)),
+        ('min_rating', _one(query, 'min_rating', _rating, 0.0)),
+        ('genres', _list(query, 'genre')),
+        ('sort', sort),
+        ('limit', _one(query, 'limit', _limit)),
+    )
+
+    def build(data):
+        p = dict(params)
+        filtered = filter_programmes(
+            data.programmes,
+            channels=p['channels'],
+            date_from=p['date_from'],
+            date_to=p['date_to'],
+            time_from=p['time_from'],
+            time_to=p['time_to'],
+            min_rating=p['min_rating'],
+            genre_ids=tmdb_ids_for_genres(data.genre_index, p['genres']) if p['genres'] else None,
+            sort=p['sort']
+        )
+        total = len(filtered)
+        if p['limit'] is not None:
+            filtered = filtered[:p['limit']]
+        return {
+            'updated_at': data.updated_at,
+            'count': total,
+            'movies': [programme_json(m, data.availability) for m in filtered]
+        }
+
+    return ('/guide',) + params, build
+
+
+def now_endpoint(query):
+    at = _one(query, 'at', datetime.fromisoformat) or epg_now()
+    # Odpowiedź zmienia się co minutę, więc tak zaokrąglamy klucz cache
+    now = to_epoch(at) // 60 * 60
+    channels = _list(query, 'channel')
+
+    def build(data):
+        ordered = [ch for ch in data.channels if ch in channels] if channels else data.channels
+        rows = now_next(data.interval_index, now, channels=ordered)
+        return {
+            'updated_at': data.updated_at,
+            'at': from_epoch(now).isoformat(),
+            'channels': [
+                {
+                    'channel_name': channel,
+                    'now': programme_json(current, data.availability) if current else None,
+                    'next': programme_json(upcoming, data.availability) if upcoming else None
+                }
+                for channel, current, upcoming in rows
+            ]
+        }
+
+    return ('/now', now, channels), build
+
+
+def streaming_endpoint(query):
+    platforms = _list(query, 'platform')
+    show_all = _one(query, 'all', _bool, False)
+    min_rating = _one(query, 'min_rating', _rating, 0.0)
+
+    def build(data):
+        movies = filter_streaming(data.streaming, platforms=platforms, show_all=show_all, min_rating=min_rating)
+        return {'count': len(movies), 'movies': movies}
+
+    return ('/streaming', platforms, show_all, min_rating), build
+
+
+ENDPOINTS = {
+    '/guide': guide_endpoint,
+    '/now': now_endpoint,
+    '/streaming': streaming_endpoint,
+}
+
+
+class GuideHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        try:
+            self._get()
+        except Exception:
+            traceback.print_exc()
+            self._send_error(500, "Wewnętrzny błąd serwera")
+
+    def _get(self):
+        url = urlsplit(self.path)
+        endpoint = ENDPOINTS.get(url.path.rstrip('/') or '/')
+        if endpoint is None:
+            return self._send_error(404, f"Nieznany endpoint: {url.path}")
+
+        data = STORE.refresh()
+        try:
+            key, build = endpoint(parse_qs(url.query))
+        except BadRequest as e:
+            return self._send_error(400, str(e))
+
+        etag = STORE.etag(data, key)
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = STORE.body(data, key, build)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    STORE.refresh()
+    server = ThreadingHTTPServer((API_HOST, API_PORT), GuideHandler)
+    print(f"📡 Smart TV Guide API: http://{API_HOST}:{API_PORT} (Ctrl+C aby zakończyć)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,17 @@
+from time import perf_counter
+
+SCRIPT_START = perf_counter()
+
 import streamlit as st
-import json
-import os
 from datetime import datetime, timedelta, time
-import pandas as pd
+
+# pandas i altair importujemy dopiero w widokach, które ich potrzebują (tabela, planer)
+from utils.models import Programme, TmdbInfo, to_epoch, from_epoch, epg_now
+from utils.indexes import tmdb_ids_for_genres, now_next
+from utils.planner import WEIGHTS, plan_schedule
+from utils.guide import load_streaming, filter_programmes, filter_streaming, streaming_rating
+from utils.availability import parse_tmdb_id, upcoming_airings
+from utils.snapshot import load_state
 
 st.set_page_config(
     page_title="📺 Smart TV Guide",
@@ -22,53 +31,304 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)
+@st.cache_resource(ttl=3600)
 def load_data():
-    data_file = 'data/movies.json'
-    if not os.path.exists(data_file):
-        return None
-    with open(data_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
+    # Dane i indeksy ze snapshotu (albo zbudowane z JSON); są niemutowalne,
+    # więc cache_resource może je współdzielić bez kopiowania
+    return load_state()
 
 @st.cache_data(ttl=86400)
 def load_streaming_data():
-    streaming_file = 'data/streaming.json'
-    if not os.path.exists(streaming_file):
-        return None
-    with open(streaming_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_streaming()
 
-data = load_data()
+# Wiersze programu, planer i sekcja streamingu to fragmenty - interakcja w nich
+# przerenderowuje tylko dany fragment, a nie cały skrypt z listą emisji.
+@st.dialog("🎬 Szczegóły filmu", width="large")
+def show_movie_details(m):
+    tmdb = m.tmdb
+    dt = m.start_dt
+    dt_end = m.end_dt
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        if tmdb and tmdb.poster:
+            st.image(tmdb.poster, use_container_width=True)
+    
+    with col2:
+        title = m.display_title
+        year = m.display_year
+        rating = m.rating
+        
+        st.markdown(f"## {title}")
+        
+        if year:
+            st.markdown(f"📅 **Rok:** {year}")
+        
+        rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
+        st.markdown(f"{rating_color} **Ocena TMDB:** {rating}/10")
+        
+        if tmdb and tmdb.genres:
+            st.markdown(f"🎭 **Gatunki:** {', '.join(tmdb.genres)}")
+        
+        st.markdown("---")
+        st.markdown("### 📺 Emisja")
+        st.markdown(f"**Kanał:** {m.channel_name}")
+        st.markdown(f"**Start:** {dt.strftime('%d.%m.%Y %H:%M')}")
+        st.markdown(f"**Koniec:** {dt_end.strftime('%H:%M')}")
+        
+        streaming = availability.get(tmdb.tmdb_id) if tmdb else None
+        if streaming:
+            st.markdown(f"**🍿 Streaming:** {', '.join(streaming['platforms'])}")
+        
+        if tmdb and tmdb.runtime:
+            duration = tmdb.runtime
+        else:
+            duration = (dt_end - dt).total_seconds() / 60
+        st.markdown(f"**Czas trwania:** {int(duration)} min")
+    
+    if tmdb and tmdb.overview:
+        st.markdown("---")
+        st.markdown("### 📖 Opis")
+        st.write(tmdb.overview)
+    
+    if tmdb and tmdb.tmdb_id:
+        st.markdown("---")
+        tmdb_url = f"https://www.themoviedb.org/movie/{tmdb.tmdb_id}"
+        st.markdown(f"[🔗 Zobacz na TMDB]({tmdb_url})")
+        if tmdb.imdb_id:
+            st.markdown(f"[🔗 Zobacz na IMDb](https://www.imdb.com/title/{tmdb.imdb_id}/)")
+    
+    if st.button("✖️ Zamknij", use_container_width=True):
+        st.rerun()
 
-if 'selected_movie' not in st.session_state:
-    st.session_state.selected_movie = None
+@st.fragment
+def channel_row(m):
+    tmdb = m.tmdb
+    dt = m.start_dt
+    
+    movie_id = m.key
+    
+    col1, col2, col3, col4 = st.columns([1, 1, 3, 1])
+    
+    with col1:
+        st.markdown(f"### {dt.strftime('%H:%M')}")
+        st.caption(dt.strftime('%d.%m'))
+    
+    with col2:
+        if tmdb and tmdb.poster:
+            st.image(tmdb.poster, width=100)
+        else:
+            st.markdown("🎬")
+    
+    with col3:
+        title = m.display_title
+        year = m.display_year
+        rating = m.rating
+        
+        rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
+        
+        st.markdown(f"**{title}** ({year}) {rating_color} **{rating}/10**")
+        
+        streaming = availability.get(tmdb.tmdb_id) if tmdb else None
+        if streaming:
+            st.caption(f"🍿 Także na: {', '.join(streaming['platforms'])}")
+        
+        if tmdb and tmdb.overview:
+            overview = tmdb.overview
+            st.caption(overview[:100] + "..." if len(overview) > 100 else overview)
+    
+    with col4:
+        if st.button("📖", key=movie_id):
+            show_movie_details(m)
+    
+    st.divider()
 
-with st.sidebar:
-    st.title("🔍 Filtry")
+@st.fragment
+def list_row(m):
+    tmdb = m.tmdb
+    dt = m.start_dt
     
-    if data:
-        all_channels = sorted(set(m['channel_name'] for m in data['movies']))
+    movie_id = f"{m.key}_list"
+    
+    col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 3, 1])
+    
+    with col1:
+        st.markdown(f"**{dt.strftime('%d.%m %H:%M')}**")
+    
+    with col2:
+        if tmdb and tmdb.poster:
+            st.image(tmdb.poster, width=80)
+    
+    with col3:
+        st.markdown(f"📺 {m.channel_name}")
+    
+    with col4:
+        title = m.display_title
+        rating = m.rating
+        rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
+        
+        st.markdown(f"**{title}** {rating_color} {rating}/10")
         
-        preferred_order = [
-            'HBO', 'HBO2', 'HBO3', 
-            'Cinemax', 'Cinemax2',
-            'TVN', 'TVN7', 
-            'Polsat',
-            'TVP1', 'TVP2',
-            'Ale Kino+',
-            'Canal+ Premium', 'Canal+ Film',
-            'Filmbox'
-        ]
+        streaming = availability.get(tmdb.tmdb_id) if tmdb else None
+        if streaming:
+            st.caption(f"🍿 Także na: {', '.join(streaming['platforms'])}")
         
-        sorted_channels = []
-        for ch in preferred_order:
-            if ch in all_channels:
-                sorted_channels.append(ch)
+        if tmdb and tmdb.overview:
+            st.caption(tmdb.overview[:80] + "...")
+    
+    with col5:
+        if st.button("📖", key=movie_id):
+            show_movie_details(m)
+    
+    st.divider()
+
+@st.fragment
+def planner_section(filtered):
+    with st.expander("🗓️ Zaplanuj wieczór", expanded=False):
+        st.caption("Najlepszy zestaw nienakładających się emisji spośród przefiltrowanych filmów.")
         
-        for ch in all_channels:
-            if ch not in sorted_channels:
-                sorted_channels.append(ch)
+        col1, col2 = st.columns(2)
+        with col1:
+            weight_option = st.selectbox("Maksymalizuj:", list(WEIGHTS))
+        with col2:
+            buffer_minutes = st.number_input("Przerwa między filmami (min):", 0, 120, 10, 5)
+        
+        plan, total = plan_schedule(filtered, WEIGHTS[weight_option], buffer_minutes)
+        
+        if not plan:
+            st.info("Brak filmów do zaplanowania.")
+        else:
+            st.write(f"**{len(plan)} filmów** · wynik: {total:.1f}")
+            
+            import pandas as pd
+            import altair as alt
+            
+            timeline = pd.DataFrame([
+                {
+                    'Film': m.display_title,
+                    'Kanał': m.channel_name,
+                    'Start': m.start_dt,
+                    'Koniec': m.end_dt,
+                    'Ocena': m.rating
+                }
+                for m in plan
+            ])
+            chart = alt.Chart(timeline).mark_bar(cornerRadius=4).encode(
+                x=alt.X('Start:T', title=None),
+                x2='Koniec:T',
+                y=alt.Y('Kanał:N', title=None),
+                color=alt.Color('Ocena:Q', scale=alt.Scale(scheme='redyellowgreen', domain=[4, 9]), legend=None),
+                tooltip=['Film', 'Kanał', alt.Tooltip('Start:T', format='%d.%m %H:%M'), alt.Tooltip('Koniec:T', format='%H:%M'), 'Ocena']
+            )
+            st.altair_chart(chart, use_container_width=True)
+            
+            for m in plan:
+                st.markdown(f"**{m.start_dt.strftime('%d.%m %H:%M')}–{m.end_dt.strftime('%H:%M')}** · 📺 {m.channel_name} · {m.display_title} ({m.rating}/10)")
+
+@st.fragment
+def streaming_section(streaming_movies, now_ts):
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        platform_filter = st.multiselect(
+            "Filtruj po platformie:",
+            options=['Netflix', 'HBO Max', 'Disney+', 'Amazon Prime', 'Apple TV+', 'Canal+', 'SkyShowtime'],
+            default=[]
+        )
+    
+    with col2:
+        show_all = st.checkbox("Pokaż wszystkie (bez platform)", value=False)
+    
+    
+    min_streaming_rating = st.slider(
+        "Min. ocena TMDB:",
+        0.0, 10.0, 6.0, 0.5,
+        key="streaming_rating"
+    )
+    
+    streaming_movies = filter_streaming(
+        streaming_movies,
+        platforms=platform_filter,
+        show_all=show_all,
+        min_rating=min_streaming_rating
+    )
+    
+    st.write(f"**Znaleziono {len(streaming_movies)} filmów**")
+    
+    if len(streaming_movies) > 0:
+        cols = st.columns(5)
+        for idx, movie in enumerate(streaming_movies[:30]):
+            col = cols[idx % 5]
+            
+            with col:
+                if movie.get('poster_url'):
+                    st.image(movie['poster_url'], use_container_width=True)
+                else:
+                    st.markdown("🎬")
+                
+                rating = streaming_rating(movie)
+                rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
+                
+                title = movie['title']
+                if len(title) > 30:
+                    title = title[:27] + "..."
+                st.markdown(f"**{title}**")
+                st.markdown(f"{rating_color} {rating}/10")
+                
+                if movie.get('year'):
+                    st.caption(f"📅 {movie['year']}")
+                
+                platforms = movie.get('platforms', [])
+                if platforms:
+                    st.caption(f"📺 {platforms[0]}")
+                else:
+                    st.caption("📺 Nieznana")
+                
+                tv_airings = upcoming_airings(availability.get(parse_tmdb_id(movie.get('tmdb_id'))), now_ts)
+                if tv_airings:
+                    channel, start = tv_airings[0]
+                    st.caption(f"📡 W TV: {channel} {from_epoch(start).strftime('%d.%m %H:%M')}")
+                
+                if st.button("📖", key=f"stream_{idx}_{movie.get('tmdb_id', idx)}"):
+                    streaming_movie_data = Programme(
+                        channel_id='streaming',
+                        channel_name=', '.join(platforms) if platforms else 'Streaming',
+                        title=movie['title'],
+                        start=now_ts,
+                        end=now_ts + 2 * 3600,
+                        tmdb=TmdbInfo(
+                            tmdb_id=parse_tmdb_id(movie.get('tmdb_id')),
+                            title=movie['title'],
+                            year=movie.get('year', ''),
+                            poster=movie.get('poster_url'),
+                            rating=rating,
+                            overview=movie.get('overview'),
+                            genres=tuple(movie.get('genres') or ()),
+                            runtime=movie.get('runtime'),
+                            imdb_id=movie.get('imdb_id')
+                        )
+                    )
+                    show_movie_details(streaming_movie_data)
+    else:
+        st.info("Brak filmów spełniających kryteria. Odznacz filtry lub zmniejsz ocenę.")
+
+SORT_OPTIONS = {
+    "⏰ Czas emisji": 'time',
+    "⭐ Ocena TMDB": 'rating',
+    "🎬 Tytuł": 'title',
+}
+
+state = load_data()
+data = state['guide']
+availability = state['availability']
+
+with st.sidebar:
+    st.title("🔍 Filtry")
+    
+    if data:
+        sorted_channels = state['channels']
+        all_channels = set(sorted_channels)
         
         default_channels = [ch for ch in sorted_channels[:15] if ch in all_channels]
         
@@ -80,26 +340,26 @@ with st.sidebar:
         
         movies = data['movies']
         if movies:
-            dates = [datetime.fromisoformat(m['start_time']) for m in movies]
-            min_date = min(dates).date()
-            max_date = max(dates).date()
+            starts = [m.start for m in movies]
+            min_date = from_epoch(min(starts)).date()
+            max_date = from_epoch(max(starts)).date()
             
-            date_from = st.date_input("Data od:", value=datetime.now().date(), min_value=min_date, max_value=max_date)
-            date_to = st.date_input("Data do:", value=datetime.now().date() + timedelta(days=3), min_value=min_date, max_value=max_date)
+            date_from = st.date_input("Data od:", value=epg_now().date(), min_value=min_date, max_value=max_date)
+            date_to = st.date_input("Data do:", value=epg_now().date() + timedelta(days=3), min_value=min_date, max_value=max_date)
         else:
-            date_from = datetime.now().date()
+            date_from = epg_now().date()
             date_to = date_from + timedelta(days=3)
         
         st.markdown("### ⏰ Godziny emisji")
         time_from = st.time_input("Od godziny:", value=time(18, 0))
         time_to = st.time_input("Do godziny:", value=time(23, 59))
         
-        min_rating = st.slider("Min. ocena IMDb:", 0.0, 10.0, 6.0, 0.5)
+        min_rating = st.slider("Min. ocena TMDB:", 0.0, 10.0, 6.0, 0.5)
         
-        sort_option = st.selectbox(
-            "Sortuj po:",
-            ["⏰ Czas emisji", "⭐ Ocena IMDb", "🎬 Tytuł"]
-        )
+        genre_index = state['genre_index']
+        selected_genres = st.multiselect("Gatunki:", options=sorted(genre_index))
+        
+        sort_option = st.selectbox("Sortuj po:", list(SORT_OPTIONS))
 
 st.title("📺 Smart TV Guide")
 
@@ -119,34 +379,53 @@ with col3:
     hours_left = (next_update - datetime.now()).total_seconds() / 3600
     st.metric("Następna za", f"{hours_left:.1f}h")
 
-st.markdown("---")
+source = "snapshot" if state['source'] == 'snapshot' else "JSON"
+st.caption(f"⚡ Pierwszy widok po {(perf_counter() - SCRIPT_START) * 1000:.0f} ms · dane: {source}")
 
-filtered = data['movies']
-
-if selected_channels:
-    filtered = [m for m in filtered if m['channel_name'] in selected_channels]
+st.markdown("---")
 
-filtered = [
-    m for m in filtered 
-    if date_from <= datetime.fromisoformat(m['start_time']).date() <= date_to
-]
+now_ts = to_epoch(epg_now())
+now_rows = now_next(
+    state['interval_index'],
+    now_ts,
+    channels=selected_channels or sorted_channels
+)
 
-filtered = [
-    m for m in filtered
-    if time_from <= datetime.fromisoformat(m['start_time']).time() <= time_to
-]
+with st.expander("🔴 Teraz w TV", expanded=True):
+    if not now_rows:
+        st.caption("Brak emisji w bieżącym programie.")
+    for channel, current, upcoming in now_rows:
+        col1, col2, col3 = st.columns([1, 3, 3])
+        
+        with col1:
+            st.markdown(f"**📺 {channel}**")
+        
+        with col2:
+            if current:
+                st.markdown(f"▶️ **{current.display_title}** ({current.start_dt.strftime('%H:%M')}–{current.end_dt.strftime('%H:%M')})")
+                st.progress((now_ts - current.start) / max(current.end - current.start, 1))
+            else:
+                st.caption("Teraz: brak filmu")
+        
+        with col3:
+            if upcoming:
+                st.markdown(f"⏭️ {upcoming.start_dt.strftime('%d.%m %H:%M')} **{upcoming.display_title}**")
+            else:
+                st.caption("Brak kolejnych emisji")
 
-filtered = [
-    m for m in filtered
-    if m.get('tmdb', {}).get('rating', 0) >= min_rating
-]
+st.markdown("---")
 
-if sort_option == "⏰ Czas emisji":
-    filtered.sort(key=lambda x: x['start_time'])
-elif sort_option == "⭐ Ocena IMDb":
-    filtered.sort(key=lambda x: x.get('tmdb', {}).get('rating', 0), reverse=True)
-else:
-    filtered.sort(key=lambda x: x.get('tmdb', {}).get('title', x['title']))
+filtered = filter_programmes(
+    data['movies'],
+    channels=selected_channels,
+    date_from=date_from,
+    date_to=date_to,
+    time_from=time_from,
+    time_to=time_to,
+    min_rating=min_rating,
+    genre_ids=tmdb_ids_for_genres(genre_index, selected_genres) if selected_genres else None,
+    sort=SORT_OPTIONS[sort_option]
+)
 
 st.write(f"**Znaleziono {len(filtered)} filmów**")
 
@@ -162,7 +441,7 @@ else:
     if view_mode == "📊 Po kanałach":
         channels_dict = {}
         for movie in filtered:
-            ch = movie['channel_name']
+            ch = movie.channel_name
             if ch not in channels_dict:
                 channels_dict[ch] = []
             channels_dict[ch].append(movie)
@@ -170,237 +449,41 @@ else:
         for channel, channel_movies in channels_dict.items():
             with st.expander(f"📺 {channel} ({len(channel_movies)} filmów)", expanded=len(channels_dict) <= 3):
                 for m in channel_movies:
-                    tmdb = m.get('tmdb', {})
-                    dt = datetime.fromisoformat(m['start_time'])
-                    
-                    movie_id = f"{m['channel_id']}_{m['start_time']}"
-                    
-                    col1, col2, col3, col4 = st.columns([1, 1, 3, 1])
-                    
-                    with col1:
-                        st.markdown(f"### {dt.strftime('%H:%M')}")
-                        st.caption(dt.strftime('%d.%m'))
-                    
-                    with col2:
-                        if tmdb.get('poster'):
-                            st.image(tmdb['poster'], width=100)
-                        else:
-                            st.markdown("🎬")
-                    
-                    with col3:
-                        title = tmdb.get('title', m['title'])
-                        year = tmdb.get('year', m.get('year', ''))
-                        rating = tmdb.get('rating', 0)
-                        
-                        rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
-                        
-                        st.markdown(f"**{title}** ({year}) {rating_color} **{rating}/10**")
-                        
-                        if tmdb.get('overview'):
-                            overview = tmdb['overview']
-                            st.caption(overview[:100] + "..." if len(overview) > 100 else overview)
-                    
-                    with col4:
-                        if st.button("📖", key=movie_id):
-                            st.session_state.selected_movie = m
-                            st.rerun()
-                    
-                    st.divider()
+                    channel_row(m)
     
     elif view_mode == "🎬 Lista z posterami":
         for m in filtered:
-            tmdb = m.get('tmdb', {})
-            dt = datetime.fromisoformat(m['start_time'])
-            
-            movie_id = f"{m['channel_id']}_{m['start_time']}_list"
-            
-            col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 3, 1])
-            
-            with col1:
-                st.markdown(f"**{dt.strftime('%d.%m %H:%M')}**")
-            
-            with col2:
-                if tmdb.get('poster'):
-                    st.image(tmdb['poster'], width=80)
-            
-            with col3:
-                st.markdown(f"📺 {m['channel_name']}")
-            
-            with col4:
-                title = tmdb.get('title', m['title'])
-                rating = tmdb.get('rating', 0)
-                rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
-                
-                st.markdown(f"**{title}** {rating_color} {rating}/10")
-                
-                if tmdb.get('overview'):
-                    st.caption(tmdb['overview'][:80] + "...")
-            
-            with col5:
-                if st.button("📖", key=movie_id):
-                    st.session_state.selected_movie = m
-                    st.rerun()
-            
-            st.divider()
+            list_row(m)
     
     else:
         table_data = []
         for m in filtered:
-            dt = datetime.fromisoformat(m['start_time'])
-            tmdb = m.get('tmdb', {})
-            title = tmdb.get('title', m['title'])
-            rating = tmdb.get('rating', 0)
+            dt = m.start_dt
+            title = m.display_title
+            rating = m.rating
             rating_emoji = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
             
             table_data.append({
                 'Data i czas': dt.strftime('%d.%m %H:%M'),
-                'Kanał': m['channel_name'],
+                'Kanał': m.channel_name,
                 'Film': title,
                 'Ocena': f"{rating_emoji} {rating}"
             })
         
+        import pandas as pd
+        
         df = pd.DataFrame(table_data)
         st.dataframe(df, use_container_width=True, hide_index=True)
 
+if filtered:
+    planner_section(filtered)
+
 st.markdown("---")
 st.markdown("## 🎬 Nowości na platformach streamingowych")
 
 streaming_data = load_streaming_data()
 
 if streaming_data and streaming_data.get('movies'):
-    streaming_movies = streaming_data['movies']
-    
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        platform_filter = st.multiselect(
-            "Filtruj po platformie:",
-            options=['Netflix', 'HBO Max', 'Disney+', 'Amazon Prime', 'Apple TV+', 'Canal+', 'SkyShowtime'],
-            default=[]
-        )
-    
-    with col2:
-        show_all = st.checkbox("Pokaż wszystkie (bez platform)", value=False)
-    
-    if not show_all:
-        streaming_movies = [m for m in streaming_movies if m.get('platforms')]
-    
-    if platform_filter:
-        streaming_movies = [
-            m for m in streaming_movies 
-            if any(p in m.get('platforms', []) for p in platform_filter)
-        ]
-    
-    min_streaming_rating = st.slider(
-        "Min. ocena IMDb:",
-        0.0, 10.0, 6.0, 0.5,
-        key="streaming_rating"
-    )
-    
-    streaming_movies = [m for m in streaming_movies if m.get('imdb_rating', 0) >= min_streaming_rating]
-    
-    st.write(f"**Znaleziono {len(streaming_movies)} filmów**")
-    
-    if len(streaming_movies) > 0:
-        cols = st.columns(5)
-        for idx, movie in enumerate(streaming_movies[:30]):
-            col = cols[idx % 5]
-            
-            with col:
-                if movie.get('poster_url'):
-                    st.image(movie['poster_url'], use_container_width=True)
-                else:
-                    st.markdown("🎬")
-                
-                rating = movie.get('imdb_rating', 0)
-                rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
-                
-                title = movie['title']
-                if len(title) > 30:
-                    title = title[:27] + "..."
-                st.markdown(f"**{title}**")
-                st.markdown(f"{rating_color} {rating}/10")
-                
-                if movie.get('year'):
-                    st.caption(f"📅 {movie['year']}")
-                
-                platforms = movie.get('platforms', [])
-                if platforms:
-                    st.caption(f"📺 {platforms[0]}")
-                else:
-                    st.caption("📺 Nieznana")
-                
-                if st.button("📖", key=f"stream_{idx}_{movie.get('tmdb_id', idx)}"):
-                    streaming_movie_data = {
-                        'title': movie['title'],
-                        'channel_name': ', '.join(platforms) if platforms else 'Streaming',
-                        'channel_id': 'streaming',
-                        'start_time': datetime.now().isoformat(),
-                        'end_time': (datetime.now() + timedelta(hours=2)).isoformat(),
-                        'tmdb': {
-                            'title': movie['title'],
-                            'year': movie.get('year', ''),
-                            'poster': movie.get('poster_url'),
-                            'rating': rating,
-                            'overview': movie.get('overview'),
-                            'tmdb_id': movie.get('tmdb_id')
-                        }
-                    }
-                    st.session_state.selected_movie = streaming_movie_data
-                    st.rerun()
-    else:
-        st.info("Brak filmów spełniających kryteria. Odznacz filtry lub zmniejsz ocenę.")
+    streaming_section(streaming_data['movies'], now_ts)
 else:
     st.info("Brak danych o nowościach streamingowych. Uruchom workflow w Actions.")
-
-if st.session_state.selected_movie:
-    m = st.session_state.selected_movie
-    tmdb = m.get('tmdb', {})
-    dt = datetime.fromisoformat(m['start_time'])
-    dt_end = datetime.fromisoformat(m['end_time'])
-    
-    @st.dialog("🎬 Szczegóły filmu", width="large")
-    def show_movie_details():
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            if tmdb.get('poster'):
-                st.image(tmdb['poster'], use_container_width=True)
-        
-        with col2:
-            title = tmdb.get('title', m['title'])
-            year = tmdb.get('year', m.get('year', ''))
-            rating = tmdb.get('rating', 0)
-            
-            st.markdown(f"## {title}")
-            
-            if year:
-                st.markdown(f"📅 **Rok:** {year}")
-            
-            rating_color = "🟢" if rating >= 7.5 else "🟡" if rating >= 6.0 else "🔴"
-            st.markdown(f"{rating_color} **Ocena IMDb:** {rating}/10")
-            
-            st.markdown("---")
-            st.markdown("### 📺 Emisja")
-            st.markdown(f"**Kanał:** {m['channel_name']}")
-            st.markdown(f"**Start:** {dt.strftime('%d.%m.%Y %H:%M')}")
-            st.markdown(f"**Koniec:** {dt_end.strftime('%H:%M')}")
-            
-            duration = (dt_end - dt).total_seconds() / 60
-            st.markdown(f"**Czas trwania:** {int(duration)} min")
-        
-        if tmdb.get('overview'):
-            st.markdown("---")
-            st.markdown("### 📖 Opis")
-            st.write(tmdb['overview'])
-        
-        if tmdb.get('tmdb_id'):
-            st.markdown("---")
-            tmdb_url = f"https://www.themoviedb.org/movie/{tmdb['tmdb_id']}"
-            st.markdown(f"[🔗 Zobacz na TMDB]({tmdb_url})")
-        
-        if st.button("✖️ Zamknij", use_container_width=True):
-            st.session_state.selected_movie = None
-            st.rerun()
-    
-    show_movie_details()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark modelu danych na syntetycznym EPG (domyślnie 100k emisji).
+Generuje dane powielając data/movies.json z przesunięciem w czasie.
+
+Użycie: python scripts/benchmark.py [liczba_emisji]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.models import programmes_from_dicts, programmes_to_dicts, to_epoch, DAY
+from utils.indexes import build_interval_index, now_next
+from utils.planner import film_key, plan_schedule
+from utils.guide import MOVIES_FILE, load_guide, save_guide
+from utils.snapshot import build_state, save_snapshot, load_snapshot
+from utils.classifier import CLASSIFIER_FIXTURE_FILE, CLASSIFIER_RULES_FILE, load_classifier, load_fixture, score
+
+
+def synthetic_rows(n):
+    """Powiela data/movies.json do n rekordów (kolejne kopie o tydzień później)"""
+    base = programmes_to_dicts(load_guide(os.path.join(ROOT, MOVIES_FILE))['movies'])
+    rows = []
+    week = 0
+    while len(rows) < n:
+        shift = timedelta(days=7 * week)
+        for m in base:
+            row = json.loads(json.dumps(m))
+            row['start_time'] = (datetime.fromisoformat(m['start_time']) + shift).isoformat()
+            row['end_time'] = (datetime.fromisoformat(m['end_time']) + shift).isoformat()
+            rows.append(row)
+            if len(rows) >= n:
+                break
+        week += 1
+    return rows
+
+
+def measure(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"  {label:<42} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+
+def measure_memory(label, func):
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<42} {current / 1024 / 1024:8.1f} MB")
+    return result
+
+
+def bench_model(n):
+    print(f"\n📦 Model danych ({n} emisji)")
+    payload = json.dumps(synthetic_rows(n), ensure_ascii=False)
+
+    dicts = measure_memory("pamięć: dict (json.loads)", lambda: json.loads(payload))
+    programmes = measure_memory("pamięć: Programme", lambda: programmes_from_dicts(json.loads(payload)))
+
+    measure("deserializacja: dict -> Programme", lambda: programmes_from_dicts(dicts))
+    measure("serializacja: Programme -> dict", lambda: programmes_to_dicts(programmes))
+
+    date_from = datetime.fromisoformat(dicts[0]['start_time']).date()
+    date_to = date_from + timedelta(days=3)
+    time_from = 18 * 3600
+
+    def filter_dicts():
+        return [
+            m for m in dicts
+            if date_from <= datetime.fromisoformat(m['start_time']).date() <= date_to
+            and datetime.fromisoformat(m['start_time']).hour * 3600 >= time_from
+        ]
+
+    lo = to_epoch(datetime.combine(date_from, datetime.min.time()))
+    hi = lo + 4 * DAY
+
+    def filter_programmes():
+        return [p for p in programmes if lo <= p.start < hi and p.start % DAY >= time_from]
+
+    a = measure("filtr daty/godziny: dict + fromisoformat", filter_dicts)
+    b = measure("filtr daty/godziny: Programme (epoch)", filter_programmes)
+    assert len(a) == len(b)
+    return programmes
+
+
+def bench_now_next(programmes):
+    print(f"\n🔴 Teraz/następnie ({len(programmes)} emisji)")
+    index = measure("budowa indeksu przedziałów", lambda: build_interval_index(programmes))
+    now = programmes[len(programmes) // 2].start + 60
+
+    def scan():
+        rows = {}
+        for p in programmes:
+            if p.start <= now < p.end:
+                rows[p.channel_name] = p
+        return rows
+
+    measure("teraz: pełny skan listy", scan)
+    rows = measure("teraz/następnie: indeks (x1000)", lambda: [now_next(index, now) for _ in range(1000)])[0]
+    assert {c: cur for c, cur, _ in rows if cur} == scan()
+
+
+def bench_planner(programmes):
+    print(f"\n🗓️ Plan seansów ({len(programmes)} emisji)")
+    plan, total = measure("weighted interval scheduling", lambda: plan_schedule(programmes, buffer_minutes=10))
+    print(f"  {len(plan)} filmów w planie, suma ocen {total:.1f}")
+    keys = [film_key(p) for p in plan]
+    assert len(keys) == len(set(keys)), "film zaplanowany więcej niż raz"
+
+
+def bench_snapshot(programmes):
+    print(f"\n💾 Plik danych ({len(programmes)} emisji)")
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'legacy', 'movies.json')
+        os.makedirs(os.path.dirname(legacy))
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': '', 'count': len(programmes), 'movies': programmes_to_dicts(programmes)},
+                      f, ensure_ascii=False, indent=2)
+
+        variants = [('stary format (indent=2)', legacy)]
+        for compression in (None, 'gzip'):
+            path = os.path.join(tmp, compression or 'plain', 'movies.json')
+            variants.append((f"format 2 ({compression or 'bez kompresji'})",
+                             save_guide(programmes, '', path=path, compression=compression)))
+
+        for label, path in variants:
+            print(f"  {'rozmiar: ' + label:<42} {os.path.getsize(path) / 1024:8.0f} KB")
+        for label, path in variants:
+            loaded = measure('wczytanie: ' + label, lambda: load_guide(path[:path.index('.json') + 5]))
+            assert loaded['movies'] == programmes
+
+
+def bench_warm_start(programmes):
+    print(f"\n⚡ Zimny start ({len(programmes)} emisji)")
+    with tempfile.TemporaryDirectory() as tmp:
+        movies_file = os.path.join(tmp, 'movies.json')
+        availability_file = os.path.join(tmp, 'availability.json')
+        snapshot_file = os.path.join(tmp, 'snapshot.pkl.gz')
+        save_guide(programmes, '', path=movies_file)
+        save_snapshot(snapshot_file, movies_file, availability_file)
+
+        cold = measure("JSON + budowa indeksów", lambda: build_state(movies_file, availability_file))
+        warm = measure("snapshot (pickle + gzip)", lambda: load_snapshot(snapshot_file, movies_file, availability_file))
+        assert warm['guide'] == cold['guide'] and warm['interval_index'] == cold['interval_index']
+
+
+def legacy_is_movie(title, category, year):
+    """Dawna heurystyka z fetch_epg.py - punkt odniesienia dla klasyfikatora"""
+    title_lower = title.lower()
+    for keyword in ['wiadomości', 'news', 'pogoda', 'sport', 'serial',
+                    'telenovela', 'show', 'koncert', 'magazyn']:
+        if keyword in title_lower:
+            return False
+    if category and 'film' in category.lower():
+        return True
+    return bool(year and year < datetime.now().year)
+
+
+def bench_classifier(programmes):
+    print(f"\n🏷️  Klasyfikacja film / nie-film ({len(programmes)} emisji)")
+    classifier = load_classifier(os.path.join(ROOT, CLASSIFIER_RULES_FILE))
+
+    def throughput(label, func):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        print(f"  {label:<42} {seconds * 1000:8.1f} ms ({len(programmes) / seconds / 1e6:.2f} mln/s)")
+
+    throughput("is_movie (pętla po słowach)", lambda: [legacy_is_movie(p.title, p.category, p.year) for p in programmes])
+    throughput("ProgrammeClassifier.classify", lambda: classifier.classify(programmes))
+
+    fixture, labels = load_fixture(os.path.join(ROOT, CLASSIFIER_FIXTURE_FILE))
+    print(f"  zestaw oznaczony: {len(fixture)} emisji (reguły dostrajano na tym zestawie)")
+    for label, predicted in (
+        ("is_movie", [legacy_is_movie(p.title, p.category, p.year) for p in fixture]),
+        ("ProgrammeClassifier", classifier.classify(fixture)),
+    ):
+        result = score(predicted, labels)
+        print(f"  {label + ': precyzja / czułość':<42} {result['precision']:8.3f} / {result['recall']:.3f}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print("=" * 60)
+    print("⏱️  Smart TV Guide - benchmark")
+    print("=" * 60)
+    programmes = bench_model(n)
+    bench_now_next(programmes)
+    bench_planner(programmes)
+    bench_snapshot(programmes)
+    bench_warm_start(programmes)
+    bench_classifier(programmes)
+
+
+if __name__ == '__main__':
+    main()
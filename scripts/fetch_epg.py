@@ -5,19 +5,29 @@ Uruchamiany automatycznie przez GitHub Actions co 6h.
 """
 
 import os
-import json
+import sys
 import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 import asyncio
 import aiohttp
 import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.models import Programme, TmdbInfo, to_epoch, intern_str
+from utils.guide import save_guide
+from utils.availability import save_availability
+from utils.snapshot import save_snapshot
+from utils.classifier import load_classifier
+from utils.tmdb import TMDB_BASE_URL, details_url, details_params, parse_details, poster_url
 
 # Konfiguracja
 TMDB_API_KEY = os.getenv('TMDB_API_KEY')
-TMDB_BASE_URL = 'https://api.themoviedb.org/3'
-TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w500'
 EPG_URL = 'https://epg.ovh/pltv.xml'
+# Kompresja data/movies.json: brak (domyślnie), 'gzip' lub 'zstd' (wymaga pakietu zstandard)
+EPG_COMPRESSION = os.getenv('EPG_COMPRESSION') or None
 
 # Kanały filmowe do śledzenia
 MOVIE_CHANNELS = [
@@ -48,12 +58,12 @@ def parse_epg(xml_content):
         channel_id = channel.get('id')
         display_name = channel.find('display-name')
         if display_name is not None:
-            channels[channel_id] = display_name.text
+            channels[channel_id] = intern_str(display_name.text)
     
     # Programy
-    programs = []
+    candidates = []
     for programme in root.findall('.//programme'):
-        channel_id = programme.get('channel')
+        channel_id = intern_str(programme.get('channel'))
         channel_name = channels.get(channel_id, channel_id)
         
         # Filtruj tylko wybrane kanały
@@ -67,7 +77,7 @@ def parse_epg(xml_content):
         title = title_elem.text if title_elem is not None else None
         
         category_elem = programme.find('category')
-        category = category_elem.text if category_elem is not None else None
+        category = intern_str(category_elem.text) if category_elem is not None else None
         
         date_elem = programme.find('date')
         year = int(date_elem.text[:4]) if date_elem is not None and date_elem.text else None
@@ -81,55 +91,35 @@ def parse_epg(xml_content):
         except:
             continue
         
-        # Tylko filmy (heurystyka)
-        if is_movie(title, category, year):
-            programs.append({
-                'channel_id': channel_id,
-                'channel_name': channel_name,
-                'title': title,
-                'start_time': start_dt.isoformat(),
-                'end_time': stop_dt.isoformat(),
-                'category': category,
-                'year': year
-            })
-    
-    print(f"✅ Znaleziono {len(programs)} filmów")
+        candidates.append(Programme(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            title=title,
+            start=to_epoch(start_dt),
+            end=to_epoch(stop_dt),
+            category=category,
+            year=year
+        ))
+    
+    # Tylko filmy (reguły z data/classifier_rules.json, cała lista naraz)
+    is_movie = load_classifier().classify(candidates)
+    programs = [p for p, movie in zip(candidates, is_movie) if movie]
+    
+    print(f"✅ Znaleziono {len(programs)} filmów (z {len(candidates)} emisji)")
     return programs
 
-def is_movie(title, category, year):
-    """Sprawdza czy program to film"""
-    if not title:
-        return False
-    
-    title_lower = title.lower()
-    
-    # Wykluczenia
-    non_movie = ['wiadomości', 'news', 'pogoda', 'sport', 'serial', 
-                 'telenovela', 'show', 'koncert', 'magazyn']
-    
-    for keyword in non_movie:
-        if keyword in title_lower:
-            return False
-    
-    # Pozytywne sygnały
-    if category and 'film' in category.lower():
-        return True
-    
-    if year and year < datetime.now().year:
-        return True
-    
-    return False
+def clean_title(title):
+    """Tytuł do wyszukiwania w TMDB (bez dopisków w nawiasach)"""
+    return title.split('(')[0].strip()
 
 async def search_tmdb_async(session, title, year=None):
     """Async szukanie w TMDB"""
     if not TMDB_API_KEY:
         return None
     
-    clean_title = title.split('(')[0].strip()
-    
     params = {
         'api_key': TMDB_API_KEY,
-        'query': clean_title,
+        'query': title,
         'language': 'pl-PL'
     }
     if year:
@@ -141,64 +131,86 @@ async def search_tmdb_async(session, title, year=None):
             results = data.get('results', [])
             if results:
                 movie = results[0]
-                return {
-                    'tmdb_id': movie['id'],
-                    'title': movie.get('title'),
-                    'year': movie.get('release_date', '')[:4] if movie.get('release_date') else None,
-                    'poster': f"{TMDB_IMAGE_BASE}{movie['poster_path']}" if movie.get('poster_path') else None,
-                    'rating': movie.get('vote_average'),
-                    'overview': movie.get('overview')
-                }
+                return TmdbInfo(
+                    tmdb_id=movie['id'],
+                    title=movie.get('title'),
+                    year=movie.get('release_date', '')[:4] if movie.get('release_date') else None,
+                    poster=poster_url(movie.get('poster_path')),
+                    rating=movie.get('vote_average'),
+                    overview=movie.get('overview')
+                )
             return None
     except:
         return None
 
+async def fetch_details_async(session, info):
+    """Uzupełnia TmdbInfo o gatunki, czas trwania i imdb_id (jedno żądanie na film)"""
+    try:
+        params = details_params(TMDB_API_KEY)
+        async with session.get(details_url(info.tmdb_id), params=params, timeout=10) as response:
+            data = await response.json()
+        details = parse_details(data)
+        return replace(
+            info,
+            genres=tuple(intern_str(g) for g in details['genres']),
+            runtime=details['runtime'],
+            imdb_id=details['imdb_id'],
+            certification=intern_str(details['certification'])
+        )
+    except:
+        return info
+
+async def gather_in_batches(items, make_task, batch_size=20):
+    """Uruchamia zadania async partiami (z przerwą na rate limit)"""
+    results = []
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        
+        print(f"  Batch {i//batch_size + 1}/{(len(items)-1)//batch_size + 1}...")
+        
+        results.extend(await asyncio.gather(*(make_task(item) for item in batch)))
+        
+        # Opóźnienie żeby nie przekroczyć rate limit
+        await asyncio.sleep(0.5)
+    return results
+
 async def enrich_with_tmdb(programs):
     """Wzbogaca programy o dane z TMDB (async)"""
     print(f"🎬 Wzbogacanie {len(programs)} filmów danymi z TMDB...")
     
-    enriched = []
-    batch_size = 20
+    # Ten sam film emitowany kilka razy szukamy i pobieramy tylko raz
+    queries = list(dict.fromkeys((clean_title(p.title), p.year) for p in programs))
     
     async with aiohttp.ClientSession() as session:
-        for i in range(0, len(programs), batch_size):
-            batch = programs[i:i + batch_size]
-            
-            print(f"  Batch {i//batch_size + 1}/{(len(programs)-1)//batch_size + 1}...")
-            
-            tasks = [search_tmdb_async(session, p['title'], p['year']) for p in batch]
-            results = await asyncio.gather(*tasks)
-            
-            for program, tmdb_data in zip(batch, results):
-                if tmdb_data:
-                    program['tmdb'] = tmdb_data
-                enriched.append(program)
-            
-            # Opóźnienie żeby nie przekroczyć rate limit
-            await asyncio.sleep(0.5)
+        print(f"🔍 Szukanie {len(queries)} unikalnych tytułów...")
+        found = await gather_in_batches(queries, lambda q: search_tmdb_async(session, *q))
+        
+        films = {info.tmdb_id: info for info in found if info}
+        print(f"📖 Pobieranie szczegółów {len(films)} filmów...")
+        detailed = await gather_in_batches(list(films.values()), lambda info: fetch_details_async(session, info))
+    
+    by_id = {info.tmdb_id: info for info in detailed}
+    by_query = {q: by_id[info.tmdb_id] for q, info in zip(queries, found) if info}
+    
+    enriched = []
+    for program in programs:
+        tmdb_data = by_query.get((clean_title(program.title), program.year))
+        if tmdb_data:
+            program = replace(program, tmdb=tmdb_data)
+        enriched.append(program)
     
     # Statystyki
-    matched = sum(1 for p in enriched if 'tmdb' in p)
+    matched = sum(1 for p in enriched if p.tmdb is not None)
     print(f"✅ Dopasowano {matched}/{len(programs)} filmów z TMDB")
     
     return enriched
 
 def save_to_json(programs):
-    """Zapisuje dane do JSON"""
-    output_file = 'data/movies.json'
-    
-    data = {
-        'updated_at': datetime.now().isoformat(),
-        'count': len(programs),
-        'movies': programs
-    }
+    """Zapisuje dane do JSON (airings + films, opcjonalnie skompresowane)"""
+    output_file = save_guide(programs, datetime.now().isoformat(), compression=EPG_COMPRESSION)
     
-    os.makedirs('data', exist_ok=True)
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"💾 Zapisano {len(programs)} filmów do {output_file}")
+    size_kb = os.path.getsize(output_file) / 1024
+    print(f"💾 Zapisano {len(programs)} filmów do {output_file} ({size_kb:.0f} KB)")
 
 def main():
     """Główna funkcja"""
@@ -227,6 +239,10 @@ def main():
         # Zapisz
         save_to_json(enriched)
         
+        # Złącz z dostępnością na platformach streamingowych
+        save_availability()
+        save_snapshot()
+        
         print("=" * 60)
         print("✅ Gotowe!")
         print("=" * 60)
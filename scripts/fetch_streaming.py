@@ -2,12 +2,17 @@
 import requests
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.availability import save_availability
+from utils.snapshot import save_snapshot
+from utils.tmdb import details_url, details_params, parse_details, poster_url
+
 RAPIDAPI_KEY = os.getenv('RAPIDAPI_KEY')
 TMDB_API_KEY = os.getenv('TMDB_API_KEY')
-TMDB_BASE_URL = 'https://api.themoviedb.org/3'
-TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w500'
 
 STREAMING_API_URL = 'https://streaming-availability.p.rapidapi.com/changes'
 
@@ -102,23 +107,26 @@ def enrich_with_tmdb(movies):
         
         if tmdb_id and TMDB_API_KEY:
             try:
-                params = {'api_key': TMDB_API_KEY, 'language': 'pl-PL'}
-                response = requests.get(f'{TMDB_BASE_URL}/movie/{tmdb_id}', params=params, timeout=10)
+                response = requests.get(details_url(tmdb_id), params=details_params(TMDB_API_KEY), timeout=10)
                 tmdb_data = response.json()
+                details = parse_details(tmdb_data)
                 
-                movie['imdb_rating'] = round(tmdb_data.get('vote_average', 0), 1)
-                movie['poster_url'] = f"{TMDB_IMAGE_BASE}{tmdb_data['poster_path']}" if tmdb_data.get('poster_path') else None
+                movie['tmdb_rating'] = round(tmdb_data.get('vote_average', 0), 1)
+                movie['poster_url'] = poster_url(tmdb_data.get('poster_path'))
                 movie['overview'] = tmdb_data.get('overview') or movie.get('overview')
                 movie['original_title'] = tmdb_data.get('original_title')
+                movie['genres'] = details['genres']
+                movie['runtime'] = details['runtime']
+                movie['imdb_id'] = movie.get('imdb_id') or details['imdb_id']
                 
-                print(f"OK - {movie['imdb_rating']}/10")
+                print(f"OK - {movie['tmdb_rating']}/10")
             except:
-                movie['imdb_rating'] = 0
+                movie['tmdb_rating'] = 0
                 movie['poster_url'] = None
                 movie['original_title'] = None
                 print("BRAK")
         else:
-            movie['imdb_rating'] = 0
+            movie['tmdb_rating'] = 0
             movie['poster_url'] = None
             movie['original_title'] = None
             print("SKIP")
@@ -126,7 +134,7 @@ def enrich_with_tmdb(movies):
         movie['filmweb_url'] = None
         enriched.append(movie)
     
-    enriched.sort(key=lambda x: (len(x['platforms']) > 0, x['imdb_rating']), reverse=True)
+    enriched.sort(key=lambda x: (len(x['platforms']) > 0, x['tmdb_rating']), reverse=True)
     
     return enriched
 
@@ -143,6 +151,9 @@ def save_streaming_data(movies):
         json.dump(data, f, ensure_ascii=False, indent=2)
     
     print(f"\nZapisano {len(movies)} filmow")
+    
+    save_availability()
+    save_snapshot()
 
 def main():
     print("=" * 70)
@@ -164,7 +175,7 @@ def main():
         print("\n2. Wzbogacanie o TMDB...")
         enriched = enrich_with_tmdb(movies)
         
-        with_ratings = [m for m in enriched if m['imdb_rating'] > 0]
+        with_ratings = [m for m in enriched if m['tmdb_rating'] > 0]
         with_platforms = [m for m in enriched if m['platforms']]
         
         print(f"\nStatystyki:")
@@ -177,7 +188,7 @@ def main():
         print("\nTop 10:")
         for idx, m in enumerate(with_platforms[:10], 1):
             platforms_str = ', '.join(m['platforms'][:2])
-            print(f"  {idx}. {m['title']} ({m.get('year', '?')}) - {m['imdb_rating']}/10 - {platforms_str}")
+            print(f"  {idx}. {m['title']} ({m.get('year', '?')}) - {m['tmdb_rating']}/10 - {platforms_str}")
         
         print("\n" + "=" * 70)
         print("Gotowe!")
@@ -0,0 +1,96 @@
+"""
+Złączenie emisji TV z dostępnością na platformach streamingowych po tmdb_id.
+
+Indeks budują skrypty fetch_* (data/availability.json), aplikacja tylko
+go wczytuje - sprawdzenie filmu to jedno wyszukanie w słowniku.
+"""
+
+import os
+import json
+from datetime import datetime
+
+from utils.guide import MOVIES_FILE, STREAMING_FILE, load_guide
+
+AVAILABILITY_FILE = 'data/availability.json'
+
+
+def parse_tmdb_id(value):
+    """Normalizuje tmdb_id (int, "603" lub "movie/603") do int albo None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).rsplit('/', 1)[-1])
+    except ValueError:
+        return None
+
+
+def build_availability(programmes, streaming_movies):
+    """Zwraca {tmdb_id: {'platforms': [...], 'airings': [[kanał, start], ...]}}
+
+    Zawiera tylko filmy obecne jednocześnie w TV i na platformach.
+    """
+    platforms = {}
+    for movie in streaming_movies:
+        tmdb_id = parse_tmdb_id(movie.get('tmdb_id'))
+        if tmdb_id and movie.get('platforms'):
+            platforms.setdefault(tmdb_id, set()).update(movie['platforms'])
+
+    airings = {}
+    for p in programmes:
+        tmdb_id = p.tmdb.tmdb_id if p.tmdb else None
+        if tmdb_id in platforms:
+            airings.setdefault(tmdb_id, []).append([p.channel_name, p.start])
+
+    return {
+        tmdb_id: {
+            'platforms': sorted(platforms[tmdb_id]),
+            'airings': sorted(items, key=lambda a: a[1])
+        }
+        for tmdb_id, items in sorted(airings.items())
+    }
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_availability(movies_file=MOVIES_FILE, streaming_file=STREAMING_FILE, output_file=AVAILABILITY_FILE):
+    """Buduje indeks z plików danych i zapisuje go do output_file"""
+    movies = load_guide(movies_file) or {}
+    streaming = _read_json(streaming_file) or {}
+
+    index = build_availability(
+        movies.get('movies', ()),
+        streaming.get('movies', [])
+    )
+
+    data = {
+        'updated_at': datetime.now().isoformat(),
+        'count': len(index),
+        'films': {str(tmdb_id): entry for tmdb_id, entry in index.items()}
+    }
+
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    print(f"🔗 Zapisano dostępność {len(index)} filmów (TV + streaming) do {output_file}")
+    return index
+
+
+def load_availability(path=AVAILABILITY_FILE):
+    """Wczytuje indeks jako {tmdb_id (int): wpis}"""
+    data = _read_json(path)
+    if not data:
+        return {}
+    return {int(tmdb_id): entry for tmdb_id, entry in data.get('films', {}).items()}
+
+
+def upcoming_airings(entry, now):
+    """Emisje z wpisu indeksu, które jeszcze się nie zaczęły (now w czasie EPG, patrz epg_now)"""
+    return [a for a in entry.get('airings', []) if a[1] >= now] if entry else []
@@ -0,0 +1,121 @@
+"""
+Klasyfikacja emisji EPG (film / nie-film) sterowana plikiem reguł.
+
+Reguły z data/classifier_rules.json są kompilowane raz: słowa kluczowe
+do jednego wyrażenia regularnego na cechę, kategorie do tablicy
+kategoria -> werdykt (kategorii jest kilkadziesiąt, emisji tysiące).
+classify() ocenia od razu całą listę sparsowanych emisji.
+"""
+
+import re
+import json
+from datetime import datetime
+
+from utils.models import Programme
+
+CLASSIFIER_RULES_FILE = 'data/classifier_rules.json'
+CLASSIFIER_FIXTURE_FILE = 'data/classifier_fixture.json'
+
+# Werdykty tablicy kategorii
+EXCLUDE, UNKNOWN, INCLUDE = -1, 0, 1
+
+
+def compile_keywords(keywords):
+    """Jedno wyrażenie dopasowujące dowolne ze słów od początku wyrazu"""
+    keywords = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, keywords)) + ')', re.IGNORECASE)
+
+
+class ProgrammeClassifier:
+    """Skompilowane reguły klasyfikacji.
+
+    Decyduje przede wszystkim kategoria: wykluczająca (serial, program,
+    krótki metraż...) albo filmowa. Dopiero gdy kategoria nic nie mówi,
+    liczą się słowa wykluczające w tytule i minimalny czas trwania
+    (globalny albo dla kanału), a filmem jest emisja z kanału filmowego
+    lub z rokiem produkcji sprzed bieżącego roku.
+    """
+
+    def __init__(self, rules, current_year=None):
+        self.title_exclude = compile_keywords(rules.get('title_exclude', ()))
+        self.category_exclude = compile_keywords(rules.get('category_exclude', ()))
+        self.category_include = compile_keywords(rules.get('category_include', ()))
+        self.min_duration = int(rules.get('min_duration_minutes', 0) * 60)
+
+        channels = rules.get('channels', {})
+        self.channel_min_duration = {
+            name: int(channel['min_duration_minutes'] * 60)
+            for name, channel in channels.items()
+            if 'min_duration_minutes' in channel
+        }
+        self.movie_channels = frozenset(
+            name for name, channel in channels.items() if channel.get('movie_channel')
+        )
+        self.current_year = current_year or datetime.now().year
+        self.categories = {}
+
+    def category_verdict(self, category):
+        """Werdykt dla kategorii, liczony raz i zapamiętywany w tablicy"""
+        verdict = self.categories.get(category)
+        if verdict is None:
+            if not category:
+                verdict = UNKNOWN
+            elif self.category_exclude and self.category_exclude.search(category):
+                verdict = EXCLUDE
+            elif self.category_include and self.category_include.search(category):
+                verdict = INCLUDE
+            else:
+                verdict = UNKNOWN
+            self.categories[category] = verdict
+        return verdict
+
+    def classify(self, programmes):
+        """Lista bool (True = film) dla emisji, w tej samej kolejności"""
+        title_excluded = self.title_exclude.search if self.title_exclude else None
+        categories = self.categories
+        category_verdict = self.category_verdict
+        min_duration = self.min_duration
+        channel_min_duration = self.channel_min_duration
+        movie_channels = self.movie_channels
+        current_year = self.current_year
+
+        result = []
+        for p in programmes:
+            verdict = categories.get(p.category)
+            if verdict is None:
+                verdict = category_verdict(p.category)
+            if verdict != UNKNOWN:
+                result.append(verdict == INCLUDE)
+            elif (
+                p.end - p.start < channel_min_duration.get(p.channel_name, min_duration)
+                or (title_excluded and title_excluded(p.title))
+            ):
+                result.append(False)
+            else:
+                result.append(p.channel_name in movie_channels or bool(p.year and p.year < current_year))
+        return result
+
+
+def load_classifier(path=CLASSIFIER_RULES_FILE, current_year=None):
+    with open(path, 'r', encoding='utf-8') as f:
+        return ProgrammeClassifier(json.load(f), current_year)
+
+
+def load_fixture(path=CLASSIFIER_FIXTURE_FILE):
+    """Oznaczone emisje: (krotka Programme, lista etykiet is_movie)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)['rows']
+    return tuple(Programme.from_dict(row) for row in rows), [row['is_movie'] for row in rows]
+
+
+def score(predicted, labels):
+    """Precyzja i czułość przewidywań względem etykiet"""
+    true_positive = sum(1 for p, label in zip(predicted, labels) if p and label)
+    predicted_positive = sum(1 for p in predicted if p)
+    positive = sum(1 for label in labels if label)
+    return {
+        'precision': true_positive / predicted_positive if predicted_positive else 0.0,
+        'recall': true_positive / positive if positive else 0.0,
+    }
@@ -0,0 +1,198 @@
+"""
+Wczytywanie danych i filtrowanie programu - wspólne dla app.py i api.py.
+"""
+
+import os
+import gzip
+import json
+from datetime import datetime, time
+
+from utils.models import (
+    SNAPSHOT_FORMAT, DAY, to_epoch,
+    programmes_from_dicts, programmes_from_snapshot, programmes_to_snapshot
+)
+
+MOVIES_FILE = 'data/movies.json'
+STREAMING_FILE = 'data/streaming.json'
+
+PREFERRED_CHANNEL_ORDER = [
+    'HBO', 'HBO2', 'HBO3',
+    'Cinemax', 'Cinemax2',
+    'TVN', 'TVN7',
+    'Polsat',
+    'TVP1', 'TVP2',
+    'Ale Kino+',
+    'Canal+ Premium', 'Canal+ Film',
+    'Filmbox'
+]
+
+SORT_KEYS = {
+    'time': lambda m: m.start,
+    'rating': lambda m: -m.rating,
+    'title': lambda m: m.display_title,
+}
+
+
+def _compressor(path):
+    """Zwraca moduł (de)kompresji dla rozszerzenia pliku albo None"""
+    if path.endswith('.gz'):
+        return gzip
+    if path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Do plików .zst potrzebny jest pakiet zstandard")
+        return zstandard
+    return None
+
+
+def guide_path(path=MOVIES_FILE):
+    """Pierwszy istniejący wariant pliku programu (.zst, .gz, zwykły JSON)"""
+    for candidate in (path + '.zst', path + '.gz', path):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _dump_snapshot(data):
+    """JSON bez wcięć, ze stałą kolejnością kluczy i jednym rekordem na linię"""
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+    parts = []
+    for key in sorted(data):
+        value = data[key]
+        if key == 'airings':
+            body = '[\n' + ',\n'.join(map(dumps, value)) + '\n]'
+        elif key == 'films':
+            body = '{\n' + ',\n'.join(
+                f'{dumps(film_id)}:{dumps(value[film_id])}' for film_id in sorted(value, key=int)
+            ) + '\n}'
+        else:
+            body = dumps(value)
+        parts.append(f'{dumps(key)}:{body}')
+    return '{' + ',\n'.join(parts) + '}\n'
+
+
+def save_guide(programmes, updated_at, path=MOVIES_FILE, compression=None):
+    """Zapisuje program w formacie 2 (airings + films), opcjonalnie gzip/zstd.
+
+    Zwraca ścieżkę zapisanego pliku; pozostałe warianty są usuwane,
+    żeby aplikacja nie wczytała nieaktualnego pliku.
+    """
+    data = programmes_to_snapshot(programmes)
+    data.update({
+        'format': SNAPSHOT_FORMAT,
+        'updated_at': updated_at,
+        'count': len(programmes)
+    })
+    payload = _dump_snapshot(data).encode('utf-8')
+
+    output_file = path + {'gzip': '.gz', 'zstd': '.zst'}.get(compression, '')
+    if compression == 'gzip':
+        payload = gzip.compress(payload, compresslevel=9, mtime=0)
+    elif compression == 'zstd':
+        payload = _compressor(output_file).ZstdCompressor(level=19).compress(payload)
+
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    with open(output_file, 'wb') as f:
+        f.write(payload)
+
+    for candidate in (path, path + '.gz', path + '.zst'):
+        if candidate != output_file and os.path.exists(candidate):
+            os.remove(candidate)
+    return output_file
+
+
+def load_guide(path=MOVIES_FILE):
+    """Wczytuje program (format 2 lub stary movies.json); 'movies' to krotka Programme"""
+    path = guide_path(path)
+    if path is None:
+        return None
+    with open(path, 'rb') as f:
+        payload = f.read()
+    compressor = _compressor(path)
+    if compressor is gzip:
+        payload = gzip.decompress(payload)
+    elif compressor is not None:
+        payload = compressor.ZstdDecompressor().decompress(payload)
+    data = json.loads(payload)
+
+    if data.get('format') == SNAPSHOT_FORMAT:
+        movies = programmes_from_snapshot(data)
+    else:
+        movies = programmes_from_dicts(data['movies'])
+    return {
+        'updated_at': data['updated_at'],
+        'count': data.get('count', len(movies)),
+        'movies': movies
+    }
+
+
+def load_streaming(path=STREAMING_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def sort_channels(channels):
+    """Kanały w preferowanej kolejności, pozostałe alfabetycznie na końcu"""
+    channels = set(channels)
+    ordered = [ch for ch in PREFERRED_CHANNEL_ORDER if ch in channels]
+    return ordered + sorted(channels.difference(ordered))
+
+
+def seconds_of_day(t):
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def filter_programmes(programmes, channels=None, date_from=None, date_to=None,
+                      time_from=None, time_to=None, min_rating=0, genre_ids=None, sort='time'):
+    """Filtruje emisje po kanałach, dniach, godzinie startu, ocenie i gatunkach.
+
+    Daty są włącznie, godziny porównywane z godziną startu emisji.
+    genre_ids to zbiór tmdb_id z indeksu gatunków (None = bez filtra).
+    """
+    filtered = programmes
+
+    if channels:
+        channel_set = set(channels)
+        filtered = [m for m in filtered if m.channel_name in channel_set]
+
+    if date_from is not None or date_to is not None:
+        day_from = to_epoch(datetime.combine(date_from, time.min)) if date_from else float('-inf')
+        day_to = to_epoch(datetime.combine(date_to, time.min)) + DAY if date_to else float('inf')
+        filtered = [m for m in filtered if day_from <= m.start < day_to]
+
+    if time_from is not None or time_to is not None:
+        seconds_from = seconds_of_day(time_from) if time_from else 0
+        seconds_to = seconds_of_day(time_to) if time_to else DAY
+        filtered = [m for m in filtered if seconds_from <= m.start % DAY <= seconds_to]
+
+    if min_rating:
+        filtered = [m for m in filtered if m.rating >= min_rating]
+
+    if genre_ids is not None:
+        filtered = [m for m in filtered if m.tmdb and m.tmdb.tmdb_id in genre_ids]
+
+    return sorted(filtered, key=SORT_KEYS[sort])
+
+
+def streaming_rating(movie):
+    # Starsze pliki streaming.json trzymały ocenę TMDB pod kluczem imdb_rating
+    return movie.get('tmdb_rating', movie.get('imdb_rating', 0)) or 0
+
+
+def filter_streaming(movies, platforms=None, show_all=False, min_rating=0):
+    """Filtruje nowości streamingowe po platformach i ocenie"""
+    if not show_all:
+        movies = [m for m in movies if m.get('platforms')]
+
+    if platforms:
+        movies = [
+            m for m in movies
+            if any(p in m.get('platforms', []) for p in platforms)
+        ]
+
+    return [m for m in movies if streaming_rating(m) >= min_rating]
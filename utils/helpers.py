@@ -1,10 +1,10 @@
+import re
 from datetime import datetime, timedelta
-import pandas as pd
 
 def format_time(dt):
     """Formatuje datetime do czytelnego formatu"""
     if isinstance(dt, str):
-        dt = pd.to_datetime(dt)
+        dt = datetime.fromisoformat(dt)
     return dt.strftime("%d.%m %H:%M")
 
 def format_duration(minutes):
@@ -28,18 +28,18 @@ def get_rating_color(rating):
 
 def filter_by_time_range(df, start_time, end_time):
     """Filtruje program po zakresie godzin"""
+    import pandas as pd
+    
     df['hour'] = pd.to_datetime(df['start_time']).dt.time
     mask = (df['hour'] >= start_time) & (df['hour'] <= end_time)
     return df[mask]
 
 def filter_by_genres(df, selected_genres):
-    """Filtruje filmy po gatunkach"""
+    """Filtruje filmy po gatunkach (lista gatunków lub string w kolumnie genres)"""
     if not selected_genres:
         return df
     
-    def has_genre(genres_str):
-        if not genres_str:
-            return False
-        return any(genre in str(genres_str) for genre in selected_genres)
-    
-    return df[df['genres'].apply(has_genre)]
+    pattern = '|'.join(map(re.escape, selected_genres))
+    genres = df['genres'].reset_index(drop=True).explode()
+    mask = genres.str.contains(pattern, regex=True, na=False).groupby(level=0).any()
+    return df[mask.to_numpy()]
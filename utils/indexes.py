@@ -0,0 +1,74 @@
+"""
+Indeksy budowane raz na wersję danych (cache w aplikacji).
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+
+
+def build_genre_index(programmes):
+    """Mapuje gatunek -> frozenset tmdb_id filmów z tym gatunkiem"""
+    index = {}
+    for p in programmes:
+        tmdb = p.tmdb
+        if tmdb is None or tmdb.tmdb_id is None:
+            continue
+        for genre in tmdb.genres:
+            index.setdefault(genre, set()).add(tmdb.tmdb_id)
+    return {genre: frozenset(ids) for genre, ids in index.items()}
+
+
+def tmdb_ids_for_genres(genre_index, selected_genres):
+    """Suma zbiorów tmdb_id dla wybranych gatunków"""
+    return frozenset().union(*(genre_index.get(g, ()) for g in selected_genres))
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelTimeline:
+    """Emisje jednego kanału posortowane po starcie (równoległe listy)"""
+    starts: tuple[int, ...]
+    ends: tuple[int, ...]
+    programmes: tuple
+
+
+def build_interval_index(programmes):
+    """Buduje indeks przedziałów: kanał -> ChannelTimeline"""
+    by_channel = {}
+    for p in programmes:
+        by_channel.setdefault(p.channel_name, []).append(p)
+    index = {}
+    for channel, items in by_channel.items():
+        items.sort(key=lambda p: (p.start, p.end))
+        index[channel] = ChannelTimeline(
+            tuple(p.start for p in items),
+            tuple(p.end for p in items),
+            tuple(items),
+        )
+    return index
+
+
+def on_now_and_next(timeline, now):
+    """Zwraca (trwająca emisja lub None, następna emisja lub None) w O(log n).
+
+    Emisje na jednym kanale nie nakładają się, więc trwać może tylko
+    ostatnia emisja rozpoczęta przed `now`.
+    """
+    i = bisect_right(timeline.starts, now)
+    current = None
+    if i and timeline.ends[i - 1] > now:
+        current = timeline.programmes[i - 1]
+    upcoming = timeline.programmes[i] if i < len(timeline.programmes) else None
+    return current, upcoming
+
+
+def now_next(interval_index, now, channels=None):
+    """Teraz/następnie dla każdego kanału: lista (kanał, teraz, następnie)"""
+    rows = []
+    for channel in channels if channels is not None else interval_index:
+        timeline = interval_index.get(channel)
+        if timeline is None:
+            continue
+        current, upcoming = on_now_and_next(timeline, now)
+        if current or upcoming:
+            rows.append((channel, current, upcoming))
+    return rows
@@ -0,0 +1,273 @@
+"""
+Kompaktowy model programu TV współdzielony przez skrypty i aplikację.
+
+Czasy trzymamy jako int sekund od 1970-01-01 w czasie lokalnym EPG
+("wall clock" Europe/Warsaw, bez strefy) - porównania i filtry to zwykła
+arytmetyka, a do datetime konwertujemy dopiero przy wyświetlaniu.
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+EPOCH = datetime(1970, 1, 1)
+DAY = 86400
+EPG_TIMEZONE = ZoneInfo('Europe/Warsaw')
+
+_intern = sys.intern
+
+
+def to_epoch(value):
+    """Konwertuje datetime lub string ISO na int sekund (czas lokalny EPG)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(EPG_TIMEZONE).replace(tzinfo=None)
+    return int((value - EPOCH).total_seconds())
+
+
+def epg_now():
+    """Bieżący czas jako naiwny datetime w czasie EPG (niezależnie od strefy serwera)"""
+    return datetime.now(EPG_TIMEZONE).replace(tzinfo=None)
+
+
+def from_epoch(ts):
+    """Konwertuje int sekund z powrotem na naiwny datetime"""
+    return EPOCH + timedelta(seconds=ts)
+
+
+def intern_str(value):
+    """Internuje string (None przepuszcza bez zmian)"""
+    return _intern(value) if value else value
+
+
+@dataclass(frozen=True, slots=True)
+class TmdbInfo:
+    """Dane filmu z TMDB - jedna instancja na tmdb_id"""
+    tmdb_id: int | None
+    title: str | None = None
+    year: str | None = None
+    poster: str | None = None
+    rating: float | None = None
+    overview: str | None = None
+    genres: tuple[str, ...] = ()
+    runtime: int | None = None
+    imdb_id: str | None = None
+    certification: str | None = None
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d.get('tmdb_id'),
+            d.get('title'),
+            d.get('year'),
+            d.get('poster'),
+            d.get('rating'),
+            d.get('overview'),
+            tuple(_intern(g) for g in d.get('genres', ())),
+            d.get('runtime'),
+            d.get('imdb_id'),
+            intern_str(d.get('certification')),
+        )
+
+    def __reduce__(self):
+        # Odtwarzanie z pickle (snapshot startowy) przez konstruktor jest
+        # szybsze niż domyślne __setstate__ klas ze slotami
+        return (TmdbInfo, (
+            self.tmdb_id, self.title, self.year, self.poster, self.rating,
+            self.overview, self.genres, self.runtime, self.imdb_id, self.certification,
+        ))
+
+    def to_dict(self):
+        d = {
+            'tmdb_id': self.tmdb_id,
+            'title': self.title,
+            'year': self.year,
+            'poster': self.poster,
+            'rating': self.rating,
+            'overview': self.overview,
+        }
+        # Pola ze szczegółów filmu zapisujemy tylko gdy są znane
+        if self.genres:
+            d['genres'] = list(self.genres)
+        if self.runtime:
+            d['runtime'] = self.runtime
+        if self.imdb_id:
+            d['imdb_id'] = self.imdb_id
+        if self.certification:
+            d['certification'] = self.certification
+        return d
+
+
+@dataclass(frozen=True, slots=True)
+class Programme:
+    """Pojedyncza emisja filmu na kanale"""
+    channel_id: str
+    channel_name: str
+    title: str
+    start: int
+    end: int
+    category: str | None = None
+    year: int | None = None
+    tmdb: TmdbInfo | None = None
+
+    def __reduce__(self):
+        return (Programme, (
+            self.channel_id, self.channel_name, self.title, self.start, self.end,
+            self.category, self.year, self.tmdb,
+        ))
+
+    @property
+    def start_dt(self):
+        return from_epoch(self.start)
+
+    @property
+    def end_dt(self):
+        return from_epoch(self.end)
+
+    @property
+    def key(self):
+        """Unikalny klucz emisji (np. dla widgetów Streamlit)"""
+        return f"{self.channel_id}_{self.start}"
+
+    @property
+    def display_title(self):
+        tmdb = self.tmdb
+        return tmdb.title if tmdb and tmdb.title else self.title
+
+    @property
+    def display_year(self):
+        tmdb = self.tmdb
+        if tmdb and tmdb.year:
+            return tmdb.year
+        return self.year or ''
+
+    @property
+    def rating(self):
+        tmdb = self.tmdb
+        return (tmdb.rating or 0) if tmdb else 0
+
+    @classmethod
+    def from_dict(cls, d, tmdb_cache=None):
+        """Tworzy Programme z rekordu w formacie movies.json"""
+        tmdb = d.get('tmdb')
+        if tmdb is not None:
+            tmdb = tmdb_from_dict(tmdb, tmdb_cache)
+        return cls(
+            _intern(d['channel_id']),
+            _intern(d['channel_name']),
+            d['title'],
+            to_epoch(d['start_time']),
+            to_epoch(d['end_time']),
+            intern_str(d.get('category')),
+            d.get('year'),
+            tmdb,
+        )
+
+    def to_dict(self):
+        """Zwraca rekord w formacie movies.json"""
+        d = {
+            'channel_id': self.channel_id,
+            'channel_name': self.channel_name,
+            'title': self.title,
+            'start_time': self.start_dt.isoformat(),
+            'end_time': self.end_dt.isoformat(),
+            'category': self.category,
+            'year': self.year,
+        }
+        if self.tmdb is not None:
+            d['tmdb'] = self.tmdb.to_dict()
+        return d
+
+
+def tmdb_from_dict(d, cache=None):
+    """Zwraca TmdbInfo, współdzieląc instancje po tmdb_id"""
+    tmdb_id = d.get('tmdb_id')
+    if cache is None or tmdb_id is None:
+        return TmdbInfo.from_dict(d)
+    info = cache.get(tmdb_id)
+    if info is None:
+        info = cache[tmdb_id] = TmdbInfo.from_dict(d)
+    return info
+
+
+def programmes_from_dicts(rows):
+    """Deserializuje listę rekordów movies.json do krotki Programme"""
+    cache = {}
+    from_dict = Programme.from_dict
+    return tuple(from_dict(d, cache) for d in rows)
+
+
+def programmes_to_dicts(programmes):
+    """Serializuje Programme do listy rekordów movies.json"""
+    return [p.to_dict() for p in programmes]
+
+
+SNAPSHOT_FORMAT = 2
+
+
+def programmes_to_snapshot(programmes):
+    """Dzieli emisje na tabelę airings i tabelę films (po tmdb_id).
+
+    Dane TMDB filmu emitowanego kilka razy zapisujemy tylko raz,
+    a czasy jako int - format 2 pliku movies.json.
+    """
+    films = {}
+    airings = []
+    for p in programmes:
+        row = {
+            'channel_id': p.channel_id,
+            'channel_name': p.channel_name,
+            'title': p.title,
+            'start': p.start,
+            'end': p.end,
+        }
+        if p.category is not None:
+            row['category'] = p.category
+        if p.year is not None:
+            row['year'] = p.year
+        tmdb = p.tmdb
+        if tmdb is not None:
+            if tmdb.tmdb_id is None:
+                row['tmdb'] = tmdb.to_dict()
+            else:
+                film_id = str(tmdb.tmdb_id)
+                if film_id not in films:
+                    film = tmdb.to_dict()
+                    del film['tmdb_id']
+                    films[film_id] = {k: v for k, v in film.items() if v is not None}
+                row['tmdb_id'] = tmdb.tmdb_id
+        airings.append(row)
+    return {'airings': airings, 'films': films}
+
+
+def programmes_from_snapshot(data):
+    """Odbudowuje krotkę Programme z tabel airings/films"""
+    films = {}
+    for film_id, film in data.get('films', {}).items():
+        film = dict(film, tmdb_id=int(film_id))
+        films[film['tmdb_id']] = TmdbInfo.from_dict(film)
+
+    programmes = []
+    append = programmes.append
+    for row in data.get('airings', []):
+        get = row.get
+        tmdb_id = get('tmdb_id')
+        if tmdb_id is not None:
+            tmdb = films.get(tmdb_id)
+        elif 'tmdb' in row:
+            tmdb = TmdbInfo.from_dict(row['tmdb'])
+        else:
+            tmdb = None
+        append(Programme(
+            _intern(row['channel_id']),
+            _intern(row['channel_name']),
+            row['title'],
+            row['start'],
+            row['end'],
+            intern_str(get('category')),
+            get('year'),
+            tmdb,
+        ))
+    return tuple(programmes)
@@ -0,0 +1,81 @@
+"""
+Planowanie seansów: wybór nienakładających się emisji o maksymalnej sumie wag
+(weighted interval scheduling, O(n log n)). Każdy film trafia do planu
+najwyżej raz, nawet jeśli ma kilka powtórek.
+"""
+
+from bisect import bisect_right
+
+WEIGHTS = {
+    "⭐ Suma ocen TMDB": lambda p: p.rating,
+    "⏱️ Ocena × czas trwania": lambda p: p.rating * (p.end - p.start) / 3600,
+    "🎬 Liczba filmów": lambda p: 1,
+}
+
+
+def film_key(p):
+    """Identyfikator filmu: tmdb_id, a bez dopasowania TMDB - znormalizowany tytuł"""
+    if p.tmdb and p.tmdb.tmdb_id:
+        return p.tmdb.tmdb_id
+    return p.title.strip(' .').casefold()
+
+
+def plan_schedule(programmes, weight=WEIGHTS["⭐ Suma ocen TMDB"], buffer_minutes=0):
+    """Zwraca (plan posortowany chronologicznie, suma wag).
+
+    Między końcem jednej emisji a startem następnej musi minąć co najmniej
+    `buffer_minutes`. Emisje o wadze <= 0 są pomijane.
+
+    Gdy optymalny plan zawiera powtórkę filmu, zostawiamy jego pierwszą
+    wybraną emisję, usuwamy pozostałe emisje tego filmu i liczymy plan
+    od nowa - zwolnione miejsce wypełniają inne filmy.
+    """
+    buffer = int(buffer_minutes * 60)
+    items = []
+    for p in programmes:
+        w = weight(p)
+        if w > 0:
+            items.append((p.end, p.start, w, p))
+    items.sort(key=lambda item: item[0])
+
+    while True:
+        plan, total = _best_plan(items, buffer)
+        chosen = {}
+        repeated = set()
+        for p in plan:
+            key = film_key(p)
+            if key in chosen:
+                repeated.add(key)
+            else:
+                chosen[key] = p
+        if not repeated:
+            return plan, total
+        items = [
+            item for item in items
+            if film_key(item[3]) not in repeated or item[3] is chosen[film_key(item[3])]
+        ]
+
+
+def _best_plan(items, buffer):
+    """Weighted interval scheduling na emisjach posortowanych po końcu"""
+    ends = [item[0] for item in items]
+
+    # best[j] - najlepsza suma dla pierwszych j emisji (po końcu),
+    # prev[j] - ile emisji kończy się przed startem j-tej (z buforem)
+    best = [0.0] * (len(items) + 1)
+    prev = [0] * (len(items) + 1)
+    for j, (_, start, w, _) in enumerate(items, 1):
+        k = bisect_right(ends, start - buffer, 0, j - 1)
+        prev[j] = k
+        best[j] = max(best[j - 1], best[k] + w)
+
+    plan = []
+    j = len(items)
+    while j > 0:
+        if best[j] == best[j - 1]:
+            j -= 1
+        else:
+            plan.append(items[j - 1][3])
+            j = prev[j]
+    plan.reverse()
+    return plan, best[-1]
@@ -0,0 +1,94 @@
+"""
+Gotowy do wczytania snapshot (pickle) z danymi i zbudowanymi indeksami.
+
+Skrypty fetch_* zapisują data/snapshot.pkl.gz po każdej aktualizacji danych.
+Aplikacja przy zimnym starcie wczytuje go jednym pickle.loads zamiast
+parsować JSON i budować indeksy. Pickle jest kompresowany gzipem, żeby każdy
+commit danych dokładał do historii repozytorium jak najmniej. Snapshot
+zawiera skróty plików źródłowych - jeśli nie pasują (albo zmienił się
+format lub plik jest uszkodzony), wracamy do budowania z JSON.
+"""
+
+import gc
+import os
+import gzip
+import pickle
+import hashlib
+
+from utils.guide import MOVIES_FILE, guide_path, load_guide, sort_channels
+from utils.indexes import build_genre_index, build_interval_index
+from utils.availability import AVAILABILITY_FILE, load_availability
+
+SNAPSHOT_FILE = 'data/snapshot.pkl.gz'
+# Zmienić przy każdej zmianie klas w utils.models / struktury stanu
+SNAPSHOT_PICKLE_FORMAT = 1
+
+
+def _source_digest(movies_file=MOVIES_FILE, availability_file=AVAILABILITY_FILE):
+    """Skrót zawartości plików, z których zbudowano stan"""
+    digest = hashlib.sha1()
+    for path in (guide_path(movies_file), availability_file):
+        if path and os.path.exists(path):
+            digest.update(path.encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def build_state(movies_file=MOVIES_FILE, availability_file=AVAILABILITY_FILE):
+    """Wczytuje dane z JSON i buduje indeksy używane przez app.py i api.py"""
+    guide = load_guide(movies_file)
+    programmes = guide['movies'] if guide else ()
+    return {
+        'guide': guide,
+        'channels': sort_channels(m.channel_name for m in programmes),
+        'genre_index': build_genre_index(programmes),
+        'interval_index': build_interval_index(programmes),
+        'availability': load_availability(availability_file),
+        'source': 'json',
+    }
+
+
+def save_snapshot(path=SNAPSHOT_FILE, movies_file=MOVIES_FILE, availability_file=AVAILABILITY_FILE):
+    """Buduje stan z plików danych i zapisuje go jako pickle"""
+    state = build_state(movies_file, availability_file)
+    state['source'] = 'snapshot'
+    payload = {
+        'format': SNAPSHOT_PICKLE_FORMAT,
+        'digest': _source_digest(movies_file, availability_file),
+        'state': state,
+    }
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), compresslevel=9, mtime=0))
+
+    print(f"⚡ Zapisano snapshot startowy do {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+def load_snapshot(path=SNAPSHOT_FILE, movies_file=MOVIES_FILE, availability_file=AVAILABILITY_FILE):
+    """Zwraca stan ze snapshotu albo None, gdy go brak lub jest nieaktualny"""
+    if not os.path.exists(path):
+        return None
+    # Przy odtwarzaniu setek tysięcy obiektów GC tylko spowalnia (nie ma cykli)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.loads(gzip.decompress(f.read()))
+    except Exception:
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if not isinstance(payload, dict):
+        return None
+    if payload.get('format') != SNAPSHOT_PICKLE_FORMAT:
+        return None
+    if payload.get('digest') != _source_digest(movies_file, availability_file):
+        return None
+    return payload['state']
+
+
+def load_state():
+    """Stan z gotowego snapshotu, a gdy się nie da - zbudowany z JSON"""
+    return load_snapshot() or build_state()
@@ -0,0 +1,50 @@
+"""
+Wspólne elementy zapytań do TMDB.
+
+Szczegóły filmu pobieramy jednym żądaniem /movie/{id} z append_to_response,
+zamiast osobno odpytywać external_ids czy release_dates.
+"""
+
+TMDB_BASE_URL = 'https://api.themoviedb.org/3'
+TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w500'
+
+DETAILS_APPEND = 'external_ids,release_dates'
+CERTIFICATION_COUNTRY = 'PL'
+
+
+def details_url(tmdb_id):
+    return f'{TMDB_BASE_URL}/movie/{tmdb_id}'
+
+
+def details_params(api_key):
+    return {
+        'api_key': api_key,
+        'language': 'pl-PL',
+        'append_to_response': DETAILS_APPEND
+    }
+
+
+def poster_url(path):
+    return f"{TMDB_IMAGE_BASE}{path}" if path else None
+
+
+def parse_certification(release_dates):
+    """Zwraca polską kategorię wiekową z bloku release_dates"""
+    for country in (release_dates or {}).get('results', []):
+        if country.get('iso_3166_1') != CERTIFICATION_COUNTRY:
+            continue
+        for release in country.get('release_dates', []):
+            if release.get('certification'):
+                return release['certification']
+    return None
+
+
+def parse_details(data):
+    """Wyciąga gatunki, czas trwania i imdb_id z odpowiedzi /movie/{id}"""
+    external_ids = data.get('external_ids') or {}
+    return {
+        'genres': [g['name'] for g in data.get('genres', []) if g.get('name')],
+        'runtime': data.get('runtime') or None,
+        'imdb_id': external_ids.get('imdb_id') or data.get('imdb_id') or None,
+        'certification': parse_certification(data.get('release_dates'))
+    }